@@ -27,7 +27,10 @@ import tkinter.scrolledtext as tkscrolled
 import gettext
 import locale
 import pathlib
-import re, os
+import re, os, io, sys, mmap, errno, codecs
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 
 def get_ui_language():
@@ -49,6 +52,30 @@ _ = lang.gettext
 
 VERBOSE = True
 
+# Big sequential requests keep the disk busy and the copy loop out of Python
+COPY_BUFSIZE = 8 * 1024 * 1024
+# The userspace copy splits COPY_BUFSIZE in this many buffers, flushed by one writev()
+WRITEV_CHUNKS = 4
+
+# Copy primitives from fastest to most portable, see _CopyStrategy
+COPY_STRATEGIES = ('copy_file_range', 'sendfile', 'userspace')
+_UNSUPPORTED_ERRNOS = {errno.EINVAL, errno.ENOSYS, errno.EXDEV, errno.ENOTSOCK,
+                       getattr(errno, 'EOPNOTSUPP', errno.ENOSYS)}
+
+# fallocate(2) flag reserving blocks without changing the file size
+FALLOC_FL_KEEP_SIZE = 0x01
+
+# posix_fadvise hints for sources read sequentially exactly once
+_READ_ONCE_ADVICES = [getattr(os, name) for name in ('POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_WILLNEED') if hasattr(os, name)]
+_DONE_ADVICES = [os.POSIX_FADV_DONTNEED] if hasattr(os, 'POSIX_FADV_DONTNEED') else []
+_MMAP_READ_ONCE_ADVICES = [mmap.MADV_SEQUENTIAL] if hasattr(mmap, 'MADV_SEQUENTIAL') else []
+_MMAP_DONE_ADVICES = [mmap.MADV_DONTNEED] if hasattr(mmap, 'MADV_DONTNEED') else []
+
+# CUE sheet syntax, matched on the raw bytes of the sheet
+_FILE_RE = re.compile(rb'FILE "?(.*?)"? BINARY')
+_TRACK_RE = re.compile(rb'TRACK (\d+) (\S*)')
+_INDEX_RE = re.compile(rb'INDEX (\d+) (\d+:\d+:\d+)')
+
 
 class BinFilesMissingException(Exception):
     pass
@@ -58,17 +85,34 @@ class ErrorException(Exception):
     pass
 
 
-def log_debug(s):
+# Debug lines are collected and printed in one go by flush_debug()
+_debug_buf = []
+
+
+# Formatting is lazy, like the logging module: nothing is built unless VERBOSE
+def log_debug(fmt, *args):
     if VERBOSE:
-        print("[DEBUG]\t%s" % s)
+        _debug_buf.append("[DEBUG]\t" + (fmt % args if args else fmt))
+
+
+def flush_debug():
+    if _debug_buf:
+        lines = _debug_buf[:]
+        del _debug_buf[:len(lines)]
+        print("\n".join(lines))
 
 
 class Track:
     globalBlocksize = None
 
+    # Indexes are kept as parallel lists: INDEX number, cue stamp and offset in sectors
+    __slots__ = ('num', 'indexes_id', 'indexes_stamp', 'indexes_offset', 'track_type', 'sectors', 'file_offset')
+
     def __init__(self, num, track_type):
         self.num = num
-        self.indexes = []
+        self.indexes_id = []
+        self.indexes_stamp = []
+        self.indexes_offset = []
         self.track_type = track_type
         self.sectors = None
         self.file_offset = None
@@ -92,85 +136,105 @@ class Track:
                 Track.globalBlocksize = 2048
             elif track_type in ['MODE2/2336', 'CDI/2336']:
                 Track.globalBlocksize = 2336
-            log_debug("Locked blocksize to %d" % Track.globalBlocksize)
+            log_debug("Locked blocksize to %d", Track.globalBlocksize)
 
 
 class File:
+    __slots__ = ('filename', 'tracks', 'size')
+
     def __init__(self, filename):
         self.filename = filename
         self.tracks = []
         self.size = os.path.getsize(filename)
 
 
-def read_cue_file(cue_path):
-    files = []
-    this_track = None
-    this_file = None
-    bin_files_missing = False
-
-    f = open(cue_path, 'r')
-    for line in f:
-        m = re.search('FILE "?(.*?)"? BINARY', line)
-        if m:
-            this_path = os.path.join(os.path.dirname(cue_path), m.group(1))
-            if not (os.path.isfile(this_path) or os.access(this_path, os.R_OK)):
-                raise ErrorException(_("Bin file not found or not readable: %s") % this_path)
-            else:
-                this_file = File(this_path)
-                files.append(this_file)
-            continue
-
-        m = re.search('TRACK (\d+) ([^\s]*)', line)
-        if m and this_file:
-            this_track = Track(int(m.group(1)), m.group(2))
-            this_file.tracks.append(this_track)
-            continue
-
-        m = re.search('INDEX (\d+) (\d+:\d+:\d+)', line)
-        if m and this_track:
-            this_track.indexes.append(
-                {'id': int(m.group(1)), 'stamp': m.group(2), 'file_offset': cuestamp_to_sectors(m.group(2))})
-            continue
-
-    if len(files) == 1:
-        # only 1 file, assume splitting, calc sectors of each
-        next_item_offset = files[0].size // Track.globalBlocksize
-        for t in reversed(files[0].tracks):
-            t.sectors = next_item_offset - t.indexes[0]["file_offset"]
-            next_item_offset = t.indexes[0]["file_offset"]
-
-    for f in files:
-        log_debug("-- File --")
-        log_debug("Filename: %s" % f.filename)
-        log_debug("Size: %d" % f.size)
-        log_debug("Tracks:")
-
-        for t in f.tracks:
-            log_debug("  -- Track --")
-            log_debug("  Num: %d" % t.num)
-            log_debug("  Type: %s" % t.track_type)
-            if t.sectors: log_debug("  Sectors: %s" % t.sectors)
-            log_debug("  Indexes: %s" % repr(t.indexes))
-
-    return files
+# Bin names are UTF-8, or in the ANSI code page for cues written by older Windows tools
+def _decode_cue_path(raw):
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode(locale.getpreferredencoding(False), 'surrogateescape')
 
 
+def read_cue_file(cue_path):
+    try:
+        files = []
+        this_track = None
+        this_file = None
+        bin_files_missing = False
+
+        with open(cue_path, 'rb') as f:
+            lines = f.read().removeprefix(codecs.BOM_UTF8).splitlines()
+
+        for line in lines:
+            # Only run the pattern matching the command that opens the line
+            command = line.lstrip().split(b' ', 1)[0].upper()
+
+            if command == b'FILE':
+                m = _FILE_RE.search(line)
+                if m:
+                    this_path = os.path.join(os.path.dirname(cue_path), _decode_cue_path(m.group(1)))
+                    if not os.path.isfile(this_path):
+                        raise ErrorException(_("Bin file not found or not readable: %s") % this_path)
+                    else:
+                        this_file = File(this_path)
+                        files.append(this_file)
+
+            elif command == b'TRACK':
+                m = _TRACK_RE.search(line)
+                if m and this_file:
+                    this_track = Track(int(m.group(1)), m.group(2).decode('ascii', 'replace'))
+                    this_file.tracks.append(this_track)
+
+            elif command == b'INDEX':
+                m = _INDEX_RE.search(line)
+                if m and this_track:
+                    stamp = m.group(2).decode('ascii')
+                    this_track.indexes_id.append(int(m.group(1)))
+                    this_track.indexes_stamp.append(stamp)
+                    this_track.indexes_offset.append(cuestamp_to_sectors(stamp))
+
+        if len(files) == 1:
+            # only 1 file, assume splitting, calc sectors of each
+            bs = Track.globalBlocksize
+            next_item_offset = files[0].size // bs
+            for t in reversed(files[0].tracks):
+                track_offset = t.indexes_offset[0]
+                t.sectors = next_item_offset - track_offset
+                next_item_offset = track_offset
+
+        if VERBOSE:
+            for f in files:
+                log_debug("-- File --")
+                log_debug("Filename: %s", f.filename)
+                log_debug("Size: %d", f.size)
+                log_debug("Tracks:")
+
+                for t in f.tracks:
+                    log_debug("  -- Track --")
+                    log_debug("  Num: %d", t.num)
+                    log_debug("  Type: %s", t.track_type)
+                    if t.sectors: log_debug("  Sectors: %s", t.sectors)
+                    log_debug("  Indexes: %r", list(zip(t.indexes_id, t.indexes_stamp, t.indexes_offset)))
+
+        return files
+    finally:
+        flush_debug()
+
+
+# Pregaps make the same positions come up over and over, so results are memoized
+@functools.lru_cache(maxsize=1 << 14)
 def sectors_to_cuestamp(sectors):
     # 75 sectors per second
-    minutes = sectors / 4500
-    fields = sectors % 4500
-    seconds = fields / 75
-    fields = sectors % 75
-    return '%02d:%02d:%02d' % (minutes, seconds, fields)
+    minutes, fields = divmod(sectors, 4500)
+    seconds, fields = divmod(fields, 75)
+    return f'{minutes:02d}:{seconds:02d}:{fields:02d}'
 
 
 def cuestamp_to_sectors(stamp):
     # 75 sectors per second
-    m = re.match("(\d+):(\d+):(\d+)", stamp)
-    minutes = int(m.group(1))
-    seconds = int(m.group(2))
-    fields = int(m.group(3))
-    return fields + (seconds * 75) + (minutes * 60 * 75)
+    minutes, seconds, fields = stamp.split(':')
+    return int(fields) + (int(seconds) * 75) + (int(minutes) * 60 * 75)
 
 
 # Generates track filename based on redump naming convention
@@ -184,79 +248,258 @@ def track_filename(prefix, track_num, track_count):
     # It'd be nice if it were consistently %02d!
     #
     if track_count > 9:
-        return "%s (Track %02d).bin" % (prefix, track_num)
-    return "%s (Track %d).bin" % (prefix, track_num)
+        return f"{prefix} (Track {track_num:02d}).bin"
+    return f"{prefix} (Track {track_num}).bin"
 
 
 # Generates a 'merged' cuesheet, that is, one bin file with tracks indexed within.
 def gen_merged_cuesheet(basename, files):
-    cuesheet = 'FILE "%s.bin" BINARY\n' % basename
+    parts = [f'FILE "{basename}.bin" BINARY\n']
     # One sector is (BLOCKSIZE) bytes
+    bs = Track.globalBlocksize
     sector_pos = 0
     for f in files:
         for t in f.tracks:
-            cuesheet += '  TRACK %02d %s\n' % (t.num, t.track_type)
-            for i in t.indexes:
-                cuesheet += '    INDEX %02d %s\n' % (i['id'], sectors_to_cuestamp(sector_pos + i['file_offset']))
-        sector_pos += f.size / Track.globalBlocksize
-    return cuesheet
+            parts.append(f'  TRACK {t.num:02d} {t.track_type}\n')
+            for index_id, index_offset in zip(t.indexes_id, t.indexes_offset):
+                parts.append(f'    INDEX {index_id:02d} {sectors_to_cuestamp(sector_pos + index_offset)}\n')
+        sector_pos += f.size // bs
+    return ''.join(parts)
 
 
 # Generates a 'split' cuesheet, that is, with one bin file for every track.
 def gen_split_cuesheet(basename, merged_file):
-    cuesheet = ""
+    parts = []
     for t in merged_file.tracks:
         track_fn = track_filename(basename, t.num, len(merged_file.tracks))
-        cuesheet += 'FILE "%s" BINARY\n' % track_fn
-        cuesheet += '  TRACK %02d %s\n' % (t.num, t.track_type)
-        for i in t.indexes:
-            sector_pos = i['file_offset'] - t.indexes[0]['file_offset']
-            cuesheet += '    INDEX %02d %s\n' % (i['id'], sectors_to_cuestamp(sector_pos))
-    return cuesheet
+        parts.append(f'FILE "{track_fn}" BINARY\n')
+        parts.append(f'  TRACK {t.num:02d} {t.track_type}\n')
+        track_offset = t.indexes_offset[0]
+        for index_id, index_offset in zip(t.indexes_id, t.indexes_offset):
+            parts.append(f'    INDEX {index_id:02d} {sectors_to_cuestamp(index_offset - track_offset)}\n')
+    return ''.join(parts)
+
+
+# Opens a bin file unbuffered and wraps it with a COPY_BUFSIZE buffer, so the
+# userspace fallback issues few large syscalls instead of many 8 KiB ones.
+def _open_fast(path, mode):
+    raw = open(path, mode, buffering=0)
+    if 'r' in mode:
+        return io.BufferedReader(raw, COPY_BUFSIZE)
+    return io.BufferedWriter(raw, COPY_BUFSIZE)
+
+
+# The copy primitive used by one merge or split, shared by its split workers.
+# A primitive failing as "unsupported" is dropped until that operation ends.
+class _CopyStrategy:
+    __slots__ = ('index',)
+
+    def __init__(self):
+        self.index = 0
+
+
+# Copies `size` bytes of `infile`, from `offset` or from its current position,
+# to `outfile`, letting the kernel move the data when the platform allows it.
+def _fast_copy(infile, outfile, size, offset, strategy_state):
+    in_fd, out_fd = infile.fileno(), outfile.fileno()
+    outfile.flush()
+    while size > 0:
+        # Split workers may hit the same failure at once, so never skip a strategy
+        current = strategy_state.index
+        strategy = COPY_STRATEGIES[current]
+        if strategy == 'userspace':
+            if _userspace_copy(infile, outfile, size, offset):
+                raise ErrorException(_("Unable to copy %s, it is shorter than expected") % infile.name)
+            return
+        try:
+            if strategy == 'copy_file_range':
+                copied = os.copy_file_range(in_fd, out_fd, size, offset)
+            elif offset is None and not sys.platform.startswith('linux'):
+                # Only Linux's sendfile() reads from the file position, elsewhere it needs an offset
+                copied = 0
+            else:
+                copied = os.sendfile(out_fd, in_fd, offset, size)
+        except (AttributeError, OSError) as exc:
+            if isinstance(exc, OSError) and exc.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            copied = 0
+        if not copied:
+            # Some filesystems answer 0 instead of an error when they can't do the
+            # copy, so an early EOF is handled as unsupported too; a source that
+            # is really short is then caught by the userspace copy.
+            strategy_state.index = max(strategy_state.index, current + 1)
+            log_debug("%s not usable here, falling back to %s", strategy, COPY_STRATEGIES[current + 1])
+            continue
+        size -= copied
+        if offset is not None:
+            offset += copied
+
+
+# Returns how many of the `size` bytes could not be copied because `infile` ended early
+def _userspace_copy(infile, outfile, size, offset=None):
+    if offset is not None and sys.maxsize > 2 ** 32:
+        # Ranged copies (split tracks) are written straight out of a mapping of the
+        # source; a 32 bit address space can't map a whole disc image.
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            _madvise(mapped, offset, size, *_MMAP_READ_ONCE_ADVICES)
+            with memoryview(mapped)[offset:offset + size] as track:
+                outfile.write(track)
+                missing = size - len(track)
+            _madvise(mapped, offset, size, *_MMAP_DONE_ADVICES)
+        return missing
+
+    if offset is not None:
+        infile.seek(offset)
+
+    if not hasattr(os, 'writev'):
+        while size > 0:
+            chunk = infile.read(min(size, COPY_BUFSIZE))
+            if not chunk:
+                break
+            outfile.write(chunk)
+            size -= len(chunk)
+        return size
+
+    # Read a few chunks into reusable buffers and hand them to the kernel with a
+    # single writev() call, instead of one write() per chunk. Reads go to the raw
+    # file: the BufferedReader would fill its own buffer first and copy it again.
+    outfile.flush()
+    out_fd = outfile.fileno()
+    raw = infile.raw
+    chunks = [memoryview(bytearray(COPY_BUFSIZE // WRITEV_CHUNKS)) for _ in range(WRITEV_CHUNKS)]
+    eof = False
+    while size > 0 and not eof:
+        pending = []
+        for chunk in chunks:
+            read = raw.readinto(chunk[:min(size, len(chunk))])
+            if not read:
+                eof = True
+                break
+            pending.append(chunk[:read])
+            size -= read
+            if not size:
+                break
+
+        while pending:
+            written = os.writev(out_fd, pending)
+            # Short writes are legal, drop whatever the kernel already took
+            while pending and written >= len(pending[0]):
+                written -= len(pending.pop(0))
+            if written:
+                pending[0] = pending[0][written:]
+    return size
+
+
+# Tells the page cache how a range of `fd` is going to be used, where supported
+def _fadvise(fd, offset, length, *advices):
+    try:
+        for advice in advices:
+            os.posix_fadvise(fd, offset, length, advice)
+    except (AttributeError, OSError):
+        pass
+
+
+# Same as _fadvise() for a range of a memory mapping
+def _madvise(mapped, offset, length, *advices):
+    # madvise wants a page aligned start
+    start = offset - offset % mmap.PAGESIZE
+    try:
+        for advice in advices:
+            mapped.madvise(advice, start, length + offset - start)
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+# Reserves `size` bytes for `outfile` up front, so the filesystem can lay out
+# the whole image at once instead of extending it on every write.
+#
+# Only Linux's fallocate(2) with FALLOC_FL_KEEP_SIZE is used: it reserves blocks
+# without writing zeros (unwritten extents, or bare clusters on vfat) and leaves
+# the file size alone. posix_fallocate() and growing the file zero-fill on FAT,
+# and on APFS growing the file only makes it sparse, so elsewhere nothing is done.
+def _preallocate(outfile, size):
+    if not size or not sys.platform.startswith('linux'):
+        return
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        fallocate = getattr(libc, 'fallocate64', None) or libc.fallocate
+        fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        # A failure just means no preallocation
+        fallocate(outfile.fileno(), FALLOC_FL_KEEP_SIZE, 0, size)
+    except (AttributeError, OSError):
+        pass
 
 
 # Merges files together to new file `merged_filename`, in listed order.
 def merge_files(merged_filename, files):
-    if os.path.exists(merged_filename):
-        raise ErrorException(_('Target bin path already exists: %s') % merged_filename)
-
-    # cat is actually a bit faster, but this is multi-platform and no special-casing
-    chunksize = 1024 * 1024
-    with open(merged_filename, 'wb') as outfile:
-        for f in files:
-            with open(f.filename, 'rb') as infile:
-                while True:
-                    chunk = infile.read(chunksize)
-                    if not chunk:
-                        break
-                    outfile.write(chunk)
-    return True
+    try:
+        if os.path.exists(merged_filename):
+            raise ErrorException(_('Target bin path already exists: %s') % merged_filename)
+
+        total = sum(f.size for f in files)
+        strategy_state = _CopyStrategy()
+
+        # cat is actually a bit faster, but this is multi-platform and no special-casing
+        try:
+            with _open_fast(merged_filename, 'wb') as outfile:
+                _preallocate(outfile, total)
+                for f in files:
+                    with _open_fast(f.filename, 'rb') as infile:
+                        # Every bin is streamed once, no point in keeping it cached afterwards
+                        _fadvise(infile.fileno(), 0, 0, *_READ_ONCE_ADVICES)
+                        _fast_copy(infile, outfile, os.fstat(infile.fileno()).st_size, None, strategy_state)
+                        _fadvise(infile.fileno(), 0, 0, *_DONE_ADVICES)
+        except BaseException:
+            # Never leave a partial image behind
+            try:
+                os.remove(merged_filename)
+            except OSError:
+                pass
+            raise
+        return True
+    finally:
+        flush_debug()
 
 
 # Writes each track in a File to a new file
 def split_files(new_basename, merged_file):
-    with open(merged_file.filename, 'rb') as infile:
+    try:
+        track_count = len(merged_file.tracks)
+
         # Check all tracks for potential file-clobbering first before writing anything
         for t in merged_file.tracks:
-            out_name = track_filename(new_basename, t.num, len(merged_file.tracks))
+            out_name = track_filename(new_basename, t.num, track_count)
             if os.path.exists(out_name):
                 raise ErrorException(_('Target bin path already exists: %s') % out_name)
 
+        jobs = []
+        offset = 0
         for t in merged_file.tracks:
-            chunksize = 1024 * 1024
-            out_name = track_filename(new_basename, t.num, len(merged_file.tracks))
             tracksize = t.sectors * Track.globalBlocksize
-            written = 0
-            with open(out_name, 'wb') as outfile:
-                while True:
-                    if chunksize + written > tracksize:
-                        chunksize = tracksize - written
-                    chunk = infile.read(chunksize)
-                    outfile.write(chunk)
-                    written += chunksize
-                    if written == tracksize:
-                        break
-    return True
+            jobs.append((track_filename(new_basename, t.num, track_count), offset, tracksize))
+            offset += tracksize
+
+        # Tracks are disjoint ranges of the source, so they can be written concurrently;
+        # the copies happen in the kernel (or in I/O calls) with the GIL released.
+        strategy_state = _CopyStrategy()
+        with ThreadPoolExecutor(max_workers=max(1, min(track_count, os.cpu_count() or 1))) as pool:
+            futures = [pool.submit(_split_track, merged_file.filename, out_name, offset, tracksize, strategy_state)
+                       for out_name, offset, tracksize in jobs]
+            for future in futures:
+                future.result()
+        return True
+    finally:
+        flush_debug()
+
+
+# Every worker opens the source on its own, so no file position is shared between threads
+def _split_track(source_filename, out_name, offset, size, strategy_state):
+    with _open_fast(source_filename, 'rb') as infile:
+        _fadvise(infile.fileno(), offset, size, *_READ_ONCE_ADVICES)
+        with _open_fast(out_name, 'xb') as outfile:
+            _fast_copy(infile, outfile, size, offset, strategy_state)
+        _fadvise(infile.fileno(), offset, size, *_DONE_ADVICES)
 
 
 class LwtbinmergeguiApp:
@@ -357,6 +600,10 @@ class LwtbinmergeguiApp:
             pass
 
 
+        # Only one merge or split at a time, they share the module state
+        self.job = None
+        self.root_level.protocol("WM_DELETE_WINDOW", self.close_action)
+
         self.main_window = self.root_level
 
     def disable_merge_ui(self):
@@ -366,7 +613,6 @@ class LwtbinmergeguiApp:
         self.merge_source_cue_btn.configure(state=tk.DISABLED)
         self.merge_input_cue.configure(state=tk.DISABLED)
         self.merge_output_cue.configure(state=tk.DISABLED)
-        self.root_level.update()
 
     def disable_split_ui(self):
         self.root_level.config(cursor="clock")
@@ -375,7 +621,6 @@ class LwtbinmergeguiApp:
         self.split_source_cue_btn.configure(state=tk.DISABLED)
         self.split_input_cue.configure(state=tk.DISABLED)
         self.split_output_cue.configure(state=tk.DISABLED)
-        self.root_level.update()
 
     def enable_merge_ui(self):
         self.root_level.config(cursor="arrow")
@@ -384,7 +629,6 @@ class LwtbinmergeguiApp:
         self.merge_source_cue_btn.configure(state=tk.NORMAL)
         self.merge_input_cue.configure(state=tk.NORMAL)
         self.merge_output_cue.configure(state=tk.NORMAL)
-        self.root_level.update()
 
     def enable_split_ui(self):
         self.root_level.config(cursor="arrow")
@@ -393,13 +637,45 @@ class LwtbinmergeguiApp:
         self.split_source_cue_btn.configure(state=tk.NORMAL)
         self.split_input_cue.configure(state=tk.NORMAL)
         self.split_output_cue.configure(state=tk.NORMAL)
-        self.root_level.update()
+
+    # Schedules `callback` on the Tk main loop, safe to call from worker threads
+    def post(self, callback, *args):
+        try:
+            self.root_level.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            # The main loop is gone, nobody is left to show this
+            pass
+
+    # Locks both tabs and runs `target` on a worker thread
+    def start_job(self, target, *args):
+        self.disable_merge_ui()
+        self.disable_split_ui()
+        self.job = threading.Thread(target=target, args=args)
+        self.job.start()
+
+    def job_done(self):
+        self.job = None
+        self.enable_merge_ui()
+        self.enable_split_ui()
+
+    def close_action(self):
+        # Closing mid-copy would leave half written bin files around
+        if self.job is not None and self.job.is_alive():
+            messagebox.showwarning(_("Please wait"), _("Wait for the current operation to finish before closing."))
+            return
+        self.root_level.destroy()
 
     def log(self, message):
         when = datetime.datetime.now()
         self.log_txt.insert(tk.END, f"[{when.strftime('%H:%M:%S')}] {message}\n")
         self.log_txt.see(tk.END)
 
+    # Same as log() for several messages, with a single redraw of the widget
+    def log_many(self, messages):
+        when = datetime.datetime.now().strftime('%H:%M:%S')
+        self.log_txt.insert(tk.END, "\n".join(f"[{when}] {message}" for message in messages) + "\n")
+        self.log_txt.see(tk.END)
+
     def run(self):
         self.main_window.mainloop()
 
@@ -427,8 +703,6 @@ class LwtbinmergeguiApp:
             self.log(_("CUE destination: %s") % self.split_output_cue_to_save)
 
     def split_btn_action(self):
-        import pathlib
-
         cuefile = self.split_input_cue.get()
 
         if not cuefile.strip() and self.split_output_cue_to_save:
@@ -442,35 +716,37 @@ class LwtbinmergeguiApp:
             return
 
         self.log_info(_("Opening cue: %s") % cuefile)
+        self.start_job(self._do_split, cuefile, self.split_output_cue_to_save)
+
+    # Runs on a worker thread, the UI is only touched through post()
+    def _do_split(self, cuefile, output_cue):
+        import pathlib
+
         try:
-            self.disable_split_ui()
             try:
                 cue_map = read_cue_file(cuefile)
             except Exception:
-                self.log_error(_("Error parsing cuesheet. Is it valid?"))
-                self.enable_split_ui()
+                self.post(self.log_error, _("Error parsing cuesheet. Is it valid?"))
                 return
 
-            output_cue_path = pathlib.Path(self.split_output_cue_to_save)
+            output_cue_path = pathlib.Path(output_cue)
             cuesheet = gen_split_cuesheet(output_cue_path.stem, cue_map[0])
-            self.log(_("Splitting started, it will take a while, don't panic!"))
-            if split_files(output_cue_path.parent.resolve() / output_cue_path.stem, cue_map[0]):
-                self.log(_("Wrote %d bin files") % len(cue_map[0].tracks))
-            else:
-                self.log_error(_("Unable to split bin files."))
-                self.enable_split_ui()
-                return False
+            self.post(self.log, _("Splitting started, it will take a while, don't panic!"))
+            if not split_files(output_cue_path.parent.resolve() / output_cue_path.stem, cue_map[0]):
+                self.post(self.log_error, _("Unable to split bin files."))
+                return
 
             with open(output_cue_path.resolve(), 'w', newline='\r\n') as f:
                 f.write(cuesheet)
-            self.log_info(_("Wrote new cue: %s") % output_cue_path.resolve())
+            self.post(self.log_many, [_("Wrote %d bin files") % len(cue_map[0].tracks),
+                                      _("Wrote new cue: %s") % output_cue_path.resolve()])
 
         except ErrorException as exc:
-            self.log_error(str(exc))
+            self.post(self.log_error, str(exc))
         except Exception:
-            self.log_error(_("Error parsing cuesheet. Is it valid?"))
-
-        self.enable_split_ui()
+            self.post(self.log_error, _("Error parsing cuesheet. Is it valid?"))
+        finally:
+            self.post(self.job_done)
 
     def merge_source_cue_action(self):
         filename = filedialog.askopenfilename(
@@ -502,8 +778,6 @@ class LwtbinmergeguiApp:
         self.log(_("ERROR %s") % msg)
 
     def merge_btn_action(self):
-        import pathlib
-
         cuefile = self.merge_input_cue.get()
 
         if not cuefile.strip() and self.merge_filename_to_save:
@@ -517,37 +791,40 @@ class LwtbinmergeguiApp:
             return
 
         self.log_info(_("Opening cue: %s") % cuefile)
+        self.start_job(self._do_merge, cuefile, self.merge_filename_to_save)
+
+    # Runs on a worker thread, the UI is only touched through post()
+    def _do_merge(self, cuefile, merged_cue):
+        import pathlib
+
         try:
-            self.disable_merge_ui()
             try:
                 cue_map = read_cue_file(cuefile)
             except Exception:
-                self.log_error(_("Error parsing cuesheet. Is it valid?"))
-                self.enable_merge_ui()
+                self.post(self.log_error, _("Error parsing cuesheet. Is it valid?"))
                 return
-            cue_out = pathlib.Path(self.merge_filename_to_save)
-            self.log_info(_("Merge operation started, it will take a while, don't panic!"))
-            self.merge_btn['state'] = tk.DISABLED
+            cue_out = pathlib.Path(merged_cue)
+            self.post(self.log_info, _("Merge operation started, it will take a while, don't panic!"))
 
             cuesheet = gen_merged_cuesheet(cue_out.stem, cue_map)
 
-            self.log_info(_("Merging %d tracks...") % len(cue_map))
+            self.post(self.log_info, _("Merging %d tracks...") % len(cue_map))
 
-            if merge_files(cue_out.with_suffix('.bin').resolve(), cue_map):
-                self.log_info(_("Wrote a new bin: %s") % cue_out.with_suffix('.bin').resolve())
-            else:
-                self.log_error(_("Unable to merge bin files."))
-                self.enable_merge_ui()
-                return False
+            if not merge_files(cue_out.with_suffix('.bin').resolve(), cue_map):
+                self.post(self.log_error, _("Unable to merge bin files."))
+                return
 
-            with open(self.merge_filename_to_save, 'w', newline='\r\n') as f:
+            with open(merged_cue, 'w', newline='\r\n') as f:
                 f.write(cuesheet)
-            self.log_info(_("Wrote new cue: %s") % self.merge_filename_to_save)
-
-        except ErrorException as exc:
-            self.log_error(str(exc))
-
-        self.enable_merge_ui()
+            self.post(self.log_many, [_("Wrote a new bin: %s") % cue_out.with_suffix('.bin').resolve(),
+                                      _("Wrote new cue: %s") % merged_cue])
+
+        except Exception as exc:
+            # ErrorException carries our own message, anything else (no space left,
+            # permissions...) would otherwise only reach stderr from this thread
+            self.post(self.log_error, str(exc))
+        finally:
+            self.post(self.job_done)
 
 
 if __name__ == "__main__":